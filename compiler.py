@@ -4,11 +4,22 @@ import subprocess
 import shutil
 import os
 import sys
-from rich.console import Console
+import atexit
+import socket
+import shlex
+import functools
+import threading
+import json
+import re
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console, Group
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
+from rich.text import Text
 from rich import box
 from pathlib import Path
+from collections import namedtuple
 
 # Initialize Rich console
 console = Console()
@@ -17,57 +28,418 @@ console = Console()
 DOCKER_IMAGE = 'yaniv242/hacenv'  # Replace with your actual Docker image name
 WORKDIR_IN_CONTAINER = '/workspace'
 EXECUTABLE_NAME = 'program'  # Default executable name
+BUILD_DIR_IN_CONTAINER = '/build'  # tmpfs inside the session container that receives the executables
+SESSION_CONTAINER_NAME = 'hac_session'  # Prefix of the long-lived container used for compile/run/valgrind
+SESSION_LABEL = 'hac.session.pid'  # Label recording the process that owns a session container
+DOCKER_SOCKET_PATH = '/var/run/docker.sock'  # Daemon socket probed on Linux/macOS
+CCACHE_HOST_DIR = os.path.join(os.path.expanduser('~'), '.hac_ccache')  # Compiler cache kept between sessions
+CCACHE_DIR_IN_CONTAINER = '/root/.ccache'
+SHELL_SENTINEL = '__HAC_DONE__'  # Prefix of the per-session marker printed with each command's exit code
+REGISTRY_MIRROR = os.environ.get('HAC_REGISTRY_MIRROR')  # Optional pull-through mirror for cold pulls
+PULL_BUFFER_SIZE = 1 << 16  # Read buffer for 'docker pull' progress output
+PULL_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.hac_compiler_pull_cache.json')
+CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.hac_compiler_config.json')
+
+# Docker binary used for every command; replaced by the resolved path in check_docker_installed()
+DOCKER = 'docker'
+
+# subprocess.run with the two output handling modes used throughout the script
+_run_captured = functools.partial(subprocess.run, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+_run_quiet = functools.partial(subprocess.run, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# Compiler used for each supported source extension
+_COMPILER_MAP = {'.c': 'gcc', '.cpp': 'g++'}
+
+# Fixed docker argument prefixes, built once instead of on every call
+_BASE_EXEC = ('exec', '-w', WORKDIR_IN_CONTAINER)
+_BASE_SESSION_RUN = ('run', '-d', '-w', WORKDIR_IN_CONTAINER)
+_SESSION_IMAGE_ARGS = ('--entrypoint', 'sleep', '--pull', 'never', DOCKER_IMAGE, 'infinity')
+
+def _exec_cmd(container_id, *command, interactive=False):
+    """Build a docker exec command line that runs command in the given container."""
+    # DOCKER is looked up per call because check_docker_installed() may replace it after import
+    if interactive:
+        return [DOCKER, *_BASE_EXEC, '-i', container_id, *command]
+    return [DOCKER, *_BASE_EXEC, container_id, *command]
+
+# Result of a command whose output was streamed to the console (mirrors subprocess.CompletedProcess)
+StreamedProcess = namedtuple('StreamedProcess', ['args', 'returncode', 'stdout', 'stderr'])
+
+# Source listings per directory, keyed to the directory mtime they were read at
+_LIST_CACHE = {}
+
+# Last rendered file listing table and the file list it was built from
+_FILES_TABLE_CACHE = {'files': None, 'table': None}
 
 # Global variable to keep track of the current compilation context
 current_context = {
     'source_dir': os.getcwd(),
     'source_file': None,
     'executable_path': None,
-    'compiler': 'gcc'  # Default compiler
+    'compiler': 'gcc',  # Default compiler
+    'network_enabled': os.environ.get('HAC_ENABLE_NETWORK') == '1',  # Opt-out of --network none for programs that need it
+    'container_id': None,  # Session container started in main()
+    'use_ccache': False,  # Whether the session image provides ccache
+    'session_thread': None,  # Background thread starting the session container
+    'session_error': None,  # Error from the background start, reported by ensure_session()
+    'shell_sentinel': None,  # Random end-of-command marker of the current session shell
+    'shell_sentinel_pattern': None,  # Regex matching the marker line and capturing the exit code
+    'shell': None  # Shell inside the session container that runs compile/run/valgrind
 }
 
+def load_json_file(path):
+    """Load a JSON settings file, returning an empty dict if it is missing or invalid."""
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return {}
+
+def save_json_file(path, data):
+    """Persist a JSON settings file; failures only cost a re-check next run."""
+    try:
+        with open(path, 'w') as json_file:
+            json.dump(data, json_file)
+    except OSError:
+        pass
+
 def check_docker_installed():
-    """Check if Docker is installed."""
-    if not shutil.which('docker'):
-        console.print("[bold red]Error:[/bold red] Docker is not installed or not found in PATH.")
-        sys.exit(1)
+    """Check if Docker is installed and remember where its binary lives."""
+    global DOCKER
+    config = load_json_file(CONFIG_PATH)
+    docker_bin = config.get('docker_bin')
+    if not docker_bin or not os.access(docker_bin, os.X_OK):
+        # Cached path missing or stale; walk PATH once and remember the result
+        docker_bin = shutil.which('docker')
+        if not docker_bin:
+            console.print("[bold red]Error:[/bold red] Docker is not installed or not found in PATH.")
+            sys.exit(1)
+        config['docker_bin'] = docker_bin
+        save_json_file(CONFIG_PATH, config)
+    DOCKER = docker_bin
+
+def ping_docker_socket(socket_path=DOCKER_SOCKET_PATH):
+    """Return True if the Docker daemon answers GET /_ping on its UNIX socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        sock.sendall(b'GET /_ping HTTP/1.0\r\nHost: docker\r\n\r\n')
+        status_line = sock.recv(64).split(b'\r\n', 1)[0]
+    return status_line.startswith(b'HTTP/') and b' 200 ' in status_line + b' '
 
 def check_docker_running():
     """Check if Docker daemon is running."""
+    # Probe the daemon socket directly to avoid starting the docker CLI. Windows
+    # (named pipe) and custom DOCKER_HOST setups fall back to 'docker info'.
+    if os.name != 'nt' and not os.environ.get('DOCKER_HOST'):
+        try:
+            if ping_docker_socket():
+                return
+        except OSError:
+            pass
     try:
-        subprocess.run(['docker', 'info'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        _run_quiet([DOCKER, 'info'], check=True)
     except subprocess.CalledProcessError:
         console.print("[bold red]Error:[/bold red] Docker daemon is not running. Please start Docker Desktop.")
         sys.exit(1)
 
-def pull_docker_image(image_name):
+def inspect_image_digest(image_name):
+    """Return the local image ID of image_name, or None if it is not present."""
+    result = subprocess.run([DOCKER, 'image', 'inspect', '--format', '{{.Id}}', image_name],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+def pull_docker_image(image_name, force=False):
     """Pull the Docker image if not available locally."""
-    try:
-        subprocess.run(['docker', 'image', 'inspect', image_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    cache = load_json_file(PULL_CACHE_PATH)
+    if not force and cache.get(image_name):
         console.print(f"[green]Docker image '{image_name}' is already available locally.[/green]")
-    except subprocess.CalledProcessError:
-        console.print(f"[yellow]Docker image '{image_name}' not found locally. Pulling from Docker Hub...[/yellow]")
+        return
+
+    digest = inspect_image_digest(image_name)
+    if digest:
+        console.print(f"[green]Docker image '{image_name}' is already available locally.[/green]")
+    else:
+        pull_name = f'{REGISTRY_MIRROR}/{image_name}' if REGISTRY_MIRROR else image_name
+        console.print(f"[yellow]Docker image '{image_name}' not found locally. Pulling '{pull_name}'...[/yellow]")
         try:
-            pull_process = subprocess.Popen(['docker', 'pull', image_name], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
-            for line in pull_process.stdout:
+            # A large pipe buffer lets each read pick up several progress lines at once
+            pull_process = subprocess.Popen([DOCKER, 'pull', pull_name], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                            bufsize=PULL_BUFFER_SIZE, universal_newlines=True)
+            while True:
+                line = pull_process.stdout.readline()
+                if not line:
+                    break
                 console.print(line.strip())
             pull_process.wait()
             if pull_process.returncode == 0:
-                console.print(f"[green]Successfully pulled '{image_name}'.[/green]")
+                console.print(f"[green]Successfully pulled '{pull_name}'.[/green]")
             else:
-                console.print(f"[bold red]Error:[/bold red] Failed to pull Docker image '{image_name}'.")
+                console.print(f"[bold red]Error:[/bold red] Failed to pull Docker image '{pull_name}'.")
                 sys.exit(1)
+            if pull_name != image_name:
+                # Tag the mirrored image so the rest of the script can keep using image_name
+                _run_quiet([DOCKER, 'tag', pull_name, image_name], check=True)
         except Exception as e:
-            console.print(f"[bold red]Error:[/bold red] Failed to pull Docker image '{image_name}'. Exception: {e}")
+            console.print(f"[bold red]Error:[/bold red] Failed to pull Docker image '{pull_name}'. Exception: {e}")
             sys.exit(1)
+        digest = inspect_image_digest(image_name)
+
+    if digest:
+        cache[image_name] = digest
+        save_json_file(PULL_CACHE_PATH, cache)
+
+def _process_alive(pid):
+    """Return True if a process with the given PID is still running."""
+    if os.name == 'nt':
+        # os.kill() would terminate the process on Windows, so query it instead
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def remove_stale_session_containers():
+    """Remove session containers whose owning process is no longer running."""
+    result = _run_captured([DOCKER, 'ps', '-a', '--filter', f'label={SESSION_LABEL}',
+                            '--format', f'{{{{.ID}}}} {{{{.Label "{SESSION_LABEL}"}}}}'])
+    if result.returncode != 0:
+        return
+    stale = []
+    for line in result.stdout.splitlines():
+        container_id, _, pid = line.partition(' ')
+        # Containers of other running instances are left alone
+        if not pid.isdigit() or not _process_alive(int(pid)):
+            stale.append(container_id)
+    if stale:
+        _run_quiet([DOCKER, 'rm', '-f', *stale])
+
+def create_session_container(source_dir):
+    """Create the session container and its shell without printing anything.
+
+    Safe to call from a background thread. Returns None on success, or an
+    error message for the caller to report.
+    """
+    try:
+        # Remove containers left behind by previous sessions that did not exit cleanly
+        remove_stale_session_containers()
+
+        # Host-side compiler cache shared by all sessions
+        os.makedirs(CCACHE_HOST_DIR, exist_ok=True)
+
+        # The mounts and network mode are the only per-session part of the command
+        docker_cmd = [
+            DOCKER, *_BASE_SESSION_RUN,
+            # One container per running instance, so concurrent instances do not clash
+            '--name', f'{SESSION_CONTAINER_NAME}_{os.getpid()}',
+            '--label', f'{SESSION_LABEL}={os.getpid()}',
+            # Compiling and running local programs needs no network; skipping it speeds up container setup
+            '--network', 'bridge' if current_context['network_enabled'] else 'none',
+            # Compiler output goes to a tmpfs (exec is needed to run it from there). The source
+            # mount stays writable so programs can create files next to their sources.
+            '-v', f'{source_dir}:{WORKDIR_IN_CONTAINER}',
+            '--tmpfs', f'{BUILD_DIR_IN_CONTAINER}:rw,exec,size=256m',
+            '-v', f'{CCACHE_HOST_DIR}:{CCACHE_DIR_IN_CONTAINER}',
+            '-e', f'CCACHE_DIR={CCACHE_DIR_IN_CONTAINER}',
+            *_SESSION_IMAGE_ARGS
+        ]
+        result = _run_captured(docker_cmd)
+        if result.returncode != 0:
+            return f"Failed to start the session container: {result.stderr.strip()}"
+
+        current_context['container_id'] = result.stdout.strip()
+
+        # Images built before ccache was added to the Dockerfile compile without it
+        ccache_check = _run_quiet(_exec_cmd(current_context['container_id'], 'sh', '-c', 'command -v ccache'))
+        current_context['use_ccache'] = ccache_check.returncode == 0
+
+        start_session_shell()
+    except Exception as e:
+        return f"Failed to execute Docker command: {e}"
+    return None
+
+def start_session_container(source_dir, error=None):
+    """Start a long-lived container with the source directory mounted, exiting on failure.
+
+    error is the result of an earlier create_session_container() attempt that
+    should be recovered from instead of starting a new one.
+    """
+    if error is None:
+        error = create_session_container(source_dir)
+    if error and 'No such image' in error:
+        # The image was removed since it was cached as present; pull it again and retry
+        pull_docker_image(DOCKER_IMAGE, force=True)
+        error = create_session_container(source_dir)
+    if error:
+        console.print(f"[bold red]Error:[/bold red] {error}")
+        sys.exit(1)
+
+def _start_session_worker(source_dir):
+    """Background thread body: record the outcome for ensure_session() to report."""
+    current_context['session_error'] = create_session_container(source_dir)
+
+def start_session_in_background(source_dir):
+    """Start the session container on a background thread while the menu is shown.
+
+    Creating the container also loads the image layers, so the first compile
+    does not pay for it. Use ensure_session() before relying on the container.
+    The thread prints nothing; errors are reported by ensure_session().
+    """
+    thread = threading.Thread(target=_start_session_worker, args=(source_dir,), daemon=True)
+    thread.start()
+    current_context['session_thread'] = thread
+
+def wait_for_session():
+    """Wait for a background session start to finish, if one is in progress."""
+    thread = current_context['session_thread']
+    if thread:
+        thread.join()
+        current_context['session_thread'] = None
+
+def ensure_session():
+    """Wait for the session container, recovering from or reporting a failed start."""
+    wait_for_session()
+    error = current_context['session_error']
+    if error:
+        current_context['session_error'] = None
+        start_session_container(current_context['source_dir'], error)
+    if not current_context['container_id']:
+        console.print("[bold red]Error:[/bold red] The session container is not available.")
+        sys.exit(1)
+
+def stop_session_container():
+    """Remove the session container, if one is running."""
+    wait_for_session()
+    stop_session_shell()
+    container_id = current_context['container_id']
+    if not container_id:
+        return
+    _run_quiet([DOCKER, 'rm', '-f', container_id])
+    current_context['container_id'] = None
 
 def get_c_files(directory):
-    """Retrieve all .c and .cpp files in the specified directory."""
+    """Retrieve all .c and .cpp files in the specified directory as (filename, compiler) tuples."""
     try:
-        return [file for file in os.listdir(directory) if file.endswith('.c') or file.endswith('.cpp')]
+        # The directory mtime changes whenever an entry is added, removed or renamed
+        mtime = os.stat(directory).st_mtime_ns
+        cached = _LIST_CACHE.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        c_files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Classify by extension once; the compiler travels with the filename
+                compiler = _COMPILER_MAP.get(os.path.splitext(entry.name)[1])
+                if compiler and entry.is_file(follow_symlinks=False):
+                    c_files.append((entry.name, compiler))
+        _LIST_CACHE[directory] = (mtime, c_files)
+        return c_files
     except FileNotFoundError:
         console.print(f"[bold red]Error:[/bold red] Directory '{directory}' does not exist.")
         return []
+    except PermissionError:
+        console.print(f"[bold red]Error:[/bold red] Permission denied reading directory '{directory}'.")
+        return []
+
+def start_session_shell():
+    """Start a shell in the session container that runs commands written to its stdin."""
+    # A random marker cannot be produced by accident in program output
+    sentinel = f'{SHELL_SENTINEL}_{secrets.token_hex(16)}'
+    current_context['shell_sentinel'] = sentinel
+    current_context['shell_sentinel_pattern'] = re.compile(rf'^(.*){sentinel} (\d+)$')
+    current_context['shell'] = subprocess.Popen(
+        _exec_cmd(current_context['container_id'], 'sh', '-s', interactive=True),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, universal_newlines=True)
+
+def stop_session_shell():
+    """Close the session shell, if one is running."""
+    shell = current_context['shell']
+    if not shell:
+        return
+    try:
+        shell.stdin.close()
+        shell.wait(timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        shell.kill()
+    current_context['shell'] = None
+
+def run_in_session_shell(command):
+    """Run a command in the session shell, printing its output as it is produced.
+
+    The output has already been shown when this returns, so the result
+    carries None for stdout and stderr.
+    """
+    shell = current_context['shell']
+    if not shell or shell.poll() is not None:
+        start_session_shell()
+        shell = current_context['shell']
+
+    # stdin is redirected so the command cannot consume the commands queued after it.
+    # stderr is merged inside the container: docker exec copies the two streams
+    # independently, so stderr could otherwise arrive after the sentinel on stdout.
+    shell.stdin.write(f'{shlex.join(command)} </dev/null 2>&1; echo "{current_context["shell_sentinel"]} $?"\n')
+    shell.stdin.flush()
+
+    sentinel_pattern = current_context['shell_sentinel_pattern']
+    for line in shell.stdout:
+        match = sentinel_pattern.match(line.rstrip('\n'))
+        if not match:
+            console.print(line.rstrip(), markup=False, highlight=False)
+            continue
+        # Output without a trailing newline ends up on the sentinel line
+        if match.group(1):
+            console.print(match.group(1), markup=False, highlight=False)
+        return StreamedProcess(command, int(match.group(2)), None, None)
+
+    # The shell exited before finishing the command (e.g. the container was removed)
+    current_context['shell'] = None
+    raise OSError("The session shell exited unexpectedly.")
+
+def _is_input_file(flag):
+    """Return True if a compilation flag is really a positional input such as helper.c or libfoo.a."""
+    return not flag.startswith('-') or flag.endswith(('.c', '.cpp', '.o', '.a'))
+
+def _compile_command(source_filename, compile_flags, compiler, output_name, use_ccache=False):
+    """Build the compiler command line for one source file."""
+    # Each flag must be its own argument; '-Wall -O2' as one argument is rejected by gcc
+    flags = shlex.split(compile_flags)
+    # Preprocess-only (-E), dependency output (-M*), runs that already stop before
+    # linking (-S, -c) and extra input files given as flags (e.g. 'helper.c', which
+    # cannot be combined with -c -o) are left to the compiler as a single call
+    if not use_ccache or any(flag in ('-E', '-S', '-c') or flag.startswith('-M') or _is_input_file(flag)
+                             for flag in flags):
+        return [compiler, *flags, '-o', output_name, source_filename]
+
+    # ccache only caches compiles to an object file, not compile-and-link calls,
+    # so compile through it with -c and link the object in a separate step
+    object_name = f'{output_name}.o'
+    compile_step = ['ccache', compiler, *flags, '-c', '-o', object_name, source_filename]
+    # Flags go after the object so libraries such as -lm resolve its symbols
+    link_step = [compiler, '-o', output_name, object_name, *flags]
+    return ['sh', '-c', f'{shlex.join(compile_step)} && {shlex.join(link_step)}']
+
+def _compile_one(container_id, compile_flags, use_ccache, source_filename, compiler, output_name):
+    """Compile one source file in the session container.
+
+    The per-build arguments come first so compile_all() can bind them with
+    functools.partial. Returns a (source_filename, returncode, stdout, stderr) tuple.
+    """
+    docker_cmd = _exec_cmd(container_id, *_compile_command(source_filename, compile_flags, compiler, output_name, use_ccache))
+    result = _run_captured(docker_cmd)
+    return source_filename, result.returncode, result.stdout, result.stderr
 
 def compile_program(source_file, compile_flags='', compiler='gcc'):
     """Compile the C/C++ program inside Docker."""
@@ -75,19 +447,11 @@ def compile_program(source_file, compile_flags='', compiler='gcc'):
     source_dir = os.path.dirname(absolute_path)
     source_filename = os.path.basename(absolute_path)
 
-    docker_image = DOCKER_IMAGE
-
-    docker_cmd = [
-        'docker', 'run', '--rm',
-        '-v', f'{source_dir}:{WORKDIR_IN_CONTAINER}',
-        '-w', WORKDIR_IN_CONTAINER,
-        docker_image,
-        compiler, compile_flags, '-o', EXECUTABLE_NAME, source_filename
-    ]
-
     console.print(f"[blue]Compiling '{source_filename}' with flags '{compile_flags}' using {compiler}...[/blue]")
+    executable_path = f'{BUILD_DIR_IN_CONTAINER}/{EXECUTABLE_NAME}'
+    command = _compile_command(source_filename, compile_flags, compiler, executable_path, current_context['use_ccache'])
     try:
-        result = subprocess.run(docker_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        result = run_in_session_shell(command)
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] Failed to execute Docker command: {e}")
         sys.exit(1)
@@ -95,28 +459,55 @@ def compile_program(source_file, compile_flags='', compiler='gcc'):
     # Update current context
     current_context['source_dir'] = source_dir
     current_context['source_file'] = source_file
-    current_context['executable_path'] = os.path.join(source_dir, EXECUTABLE_NAME)
+    if result.returncode == 0:
+        current_context['executable_path'] = executable_path
     current_context['compiler'] = compiler
 
     return result
 
+def compile_all(files, compile_flags=''):
+    """Compile several C/C++ programs concurrently, one worker thread per file.
+
+    subprocess.run releases the GIL while it waits on docker exec, so threads
+    overlap the compiles without starting extra interpreters.
+
+    Each source is built into <filename>.out in the build directory. Keeping the
+    extension stops foo.c and foo.cpp, or a program.c, from overwriting each
+    other or the executable of the last single compile.
+    files is a list of (filename, compiler) tuples as returned by get_c_files().
+    Returns a dict mapping each filename to its exit code.
+    """
+    if not files:
+        return {}
+    sources = [filename for filename, _ in files]
+    compilers = [compiler for _, compiler in files]
+    output_names = [f'{BUILD_DIR_IN_CONTAINER}/{source}.out' for source in sources]
+    compile_one = functools.partial(_compile_one, current_context['container_id'], compile_flags, current_context['use_ccache'])
+
+    console.print(f"[blue]Compiling {len(sources)} file(s) with flags '{compile_flags}'...[/blue]")
+    statuses = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(sources), os.cpu_count() or 1)) as executor:
+            for source_filename, returncode, stdout, stderr in executor.map(compile_one, sources, compilers, output_names):
+                console.print(f"[bold magenta]{source_filename}[/bold magenta]")
+                display_compile_results(subprocess.CompletedProcess(source_filename, returncode, stdout, stderr))
+                statuses[source_filename] = returncode
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] Failed to execute Docker command: {e}")
+        sys.exit(1)
+
+    return statuses
+
 def run_program(program_args, source_dir):
     """Run the compiled program inside Docker."""
-    executable_path = f'{WORKDIR_IN_CONTAINER}/{EXECUTABLE_NAME}'
+    executable_path = f'{BUILD_DIR_IN_CONTAINER}/{EXECUTABLE_NAME}'
 
-    # Prepare arguments
-    args = [f'./{EXECUTABLE_NAME}'] + program_args
-
-    docker_cmd = [
-        'docker', 'run', '--rm',
-        '-v', f'{source_dir}:{WORKDIR_IN_CONTAINER}',
-        '-w', WORKDIR_IN_CONTAINER,
-        DOCKER_IMAGE,
-    ] + args
+    # Prepare arguments (the program runs from the source directory so relative paths for reading and writing files work)
+    args = [executable_path] + program_args
 
     console.print(f"[blue]Running the program with arguments: {' '.join(program_args)}[/blue]")
     try:
-        result = subprocess.run(docker_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        result = run_in_session_shell(args)
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] Failed to execute Docker command: {e}")
         sys.exit(1)
@@ -125,62 +516,137 @@ def run_program(program_args, source_dir):
 
 def run_valgrind(program_args, source_dir):
     """Run Valgrind on the compiled program inside Docker."""
-    executable_path = f'{WORKDIR_IN_CONTAINER}/{EXECUTABLE_NAME}'
+    executable_path = f'{BUILD_DIR_IN_CONTAINER}/{EXECUTABLE_NAME}'
 
-    docker_cmd = [
-        'docker', 'run', '--rm',
-        '-v', f'{source_dir}:{WORKDIR_IN_CONTAINER}',
-        '-w', WORKDIR_IN_CONTAINER,
-        DOCKER_IMAGE,
-        'valgrind', '--leak-check=full', '--error-exitcode=1', f'./{EXECUTABLE_NAME}'
-    ] + program_args
+    command = ['valgrind', '--leak-check=full', '--error-exitcode=1', executable_path] + program_args
 
     console.print(f"[blue]Running Valgrind with arguments: {' '.join(program_args)}[/blue]")
     try:
-        result = subprocess.run(docker_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        result = run_in_session_shell(command)
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] Failed to execute Valgrind: {e}")
         sys.exit(1)
 
     return result
 
+def save_executable(source_dir):
+    """Copy the compiled program from the build directory back to the source directory."""
+    destination = os.path.join(source_dir, EXECUTABLE_NAME)
+    # 'docker cp' cannot read from tmpfs mounts, so stream the file out through the container
+    docker_cmd = _exec_cmd(current_context['container_id'], 'cat', current_context['executable_path'])
+    # Write next to the destination first so a failed copy keeps any previously saved executable
+    partial_path = f'{destination}.partial'
+    try:
+        with open(partial_path, 'wb') as executable_file:
+            result = subprocess.run(docker_cmd, stdout=executable_file, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            os.remove(partial_path)
+            console.print(f"[bold red]Error:[/bold red] Failed to save the executable: {result.stderr.decode(errors='replace').strip()}")
+            return
+        os.chmod(partial_path, os.stat(partial_path).st_mode | 0o111)
+        os.replace(partial_path, destination)
+    except OSError as e:
+        console.print(f"[bold red]Error:[/bold red] Failed to save the executable: {e}")
+        return
+
+    console.print(f"[bold green]Executable saved to '{destination}'.[/bold green]")
+
 def display_compile_results(result):
     """Display compilation warnings and errors."""
+    # Collect everything first so the console writes it out in one go
+    renderables = []
     if result.stdout:
-        console.print("[bold cyan]Compilation Standard Output:[/bold cyan]")
-        console.print(result.stdout)
+        renderables += ["[bold cyan]Compilation Standard Output:[/bold cyan]", Text(result.stdout)]
     if result.stderr:
-        console.print("[bold yellow]Compilation Warnings/Errors:[/bold yellow]")
-        console.print(result.stderr)
+        renderables += ["[bold yellow]Compilation Warnings/Errors:[/bold yellow]", Text(result.stderr)]
     if result.returncode != 0:
-        console.print("[bold red]Compilation failed.[/bold red]")
+        renderables.append("[bold red]Compilation failed.[/bold red]")
     else:
-        console.print("[bold green]Compilation succeeded.[/bold green]")
+        renderables.append("[bold green]Compilation succeeded.[/bold green]")
+    console.print(Group(*renderables))
+
+def display_compile_all_results(statuses):
+    """Display a per-file summary after compiling several programs."""
+    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
+    table.add_column("Filename", min_width=20)
+    table.add_column("Status", min_width=10)
+    for filename, returncode in sorted(statuses.items()):
+        status = "[green]OK[/green]" if returncode == 0 else f"[red]Failed ({returncode})[/red]"
+        table.add_row(filename, status)
+
+    failed = sum(1 for returncode in statuses.values() if returncode != 0)
+    if failed:
+        summary = f"[bold red]Compilation failed for {failed} of {len(statuses)} file(s).[/bold red]"
+    else:
+        summary = f"[bold green]Compiled {len(statuses)} file(s) successfully.[/bold green]"
+    console.print(Group(table, summary))
 
 def display_run_results(result):
     """Display program output and errors."""
+    renderables = []
     if result.stdout:
-        console.print("[bold green]Program Output:[/bold green]")
-        console.print(result.stdout)
+        renderables += ["[bold green]Program Output:[/bold green]", Text(result.stdout)]
     if result.stderr:
-        console.print("[bold red]Program Errors:[/bold red]")
-        console.print(result.stderr)
+        renderables += ["[bold red]Program Errors:[/bold red]", Text(result.stderr)]
     if result.returncode != 0:
-        console.print(f"[bold red]Program exited with return code {result.returncode}.[/bold red]")
+        renderables.append(f"[bold red]Program exited with return code {result.returncode}.[/bold red]")
     else:
-        console.print("[bold green]Program executed successfully.[/bold green]")
+        renderables.append("[bold green]Program executed successfully.[/bold green]")
+    console.print(Group(*renderables))
 
 def display_valgrind_results(result):
     """Display Valgrind output."""
     if result.returncode == 0:
         console.print("[bold green]Valgrind: No memory leaks or errors detected.[/bold green]")
-    else:
-        console.print("[bold red]Valgrind: Memory leaks or errors detected![/bold red]")
-        if result.stderr:
-            console.print("[bold red]Valgrind Errors:[/bold red]")
-            console.print(result.stderr)
-        else:
-            console.print("[bold red]Valgrind detected errors, but no error messages were captured.[/bold red]")
+        return
+
+    renderables = ["[bold red]Valgrind: Memory leaks or errors detected![/bold red]"]
+    if result.stderr:
+        renderables += ["[bold red]Valgrind Errors:[/bold red]", Text(result.stderr)]
+    elif result.stderr is not None:
+        renderables.append("[bold red]Valgrind detected errors, but no error messages were captured.[/bold red]")
+    console.print(Group(*renderables))
+
+def build_files_table(c_files):
+    """Return the numbered file listing table, rebuilding it only when the list changed."""
+    files = tuple(c_files)
+    if _FILES_TABLE_CACHE['files'] != files:
+        table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
+        table.add_column("No.", style="dim", width=6)
+        table.add_column("Filename", min_width=20)
+
+        for idx, (file, _) in enumerate(files, 1):
+            table.add_row(str(idx), file)
+
+        _FILES_TABLE_CACHE['files'] = files
+        _FILES_TABLE_CACHE['table'] = table
+    return _FILES_TABLE_CACHE['table']
+
+def build_menu_table():
+    """Build the static main menu table."""
+    table = Table(title="C/C++ Compiler Menu", box=box.ROUNDED, show_header=False, header_style="bold magenta")
+    table.add_column("Option", style="dim", width=6)
+    table.add_column("Description", min_width=20)
+
+    table.add_row("1", "List C/C++ source files")
+    table.add_row("2", "Compile a C/C++ program")
+    table.add_row("3", "Run the compiled program")
+    table.add_row("4", "Run Valgrind on the program")
+    table.add_row("5", "Change Source Directory")
+    table.add_row("6", "Compile all C/C++ programs")
+    table.add_row("7", "Save the compiled program to the source directory")
+    table.add_row("8", "Exit")
+    return table
+
+def ask_compile_flags():
+    """Prompt for compilation flags until they can be split into arguments."""
+    while True:
+        compile_flags = Prompt.ask("Enter compilation flags (default: -Wall)", default="-Wall")
+        try:
+            shlex.split(compile_flags)
+            return compile_flags
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] Invalid compilation flags: {e}")
 
 def select_source_file():
     """Allow the user to select a source file from the current directory."""
@@ -189,38 +655,26 @@ def select_source_file():
         console.print("[bold red]No C/C++ source files found in the current directory.[/bold red]")
         return None
 
-    table = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-    table.add_column("No.", style="dim", width=6)
-    table.add_column("Filename", min_width=20)
-
-    for idx, file in enumerate(c_files, 1):
-        table.add_row(str(idx), file)
-
-    console.print(table)
+    console.print(build_files_table(c_files))
 
     choices = [str(i) for i in range(1, len(c_files)+1)]
     choice = Prompt.ask(f"Select a file to compile [1-{len(c_files)}]", choices=choices)
 
-    selected_file = c_files[int(choice)-1]
+    selected_file, _ = c_files[int(choice)-1]
     return os.path.join(current_context['source_dir'], selected_file)
 
 def interactive_menu():
     """Display an interactive menu to the user."""
+    # The menu never changes, so build it once for the whole session
+    menu_table = build_menu_table()
     while True:
-        table = Table(title="C/C++ Compiler Menu", box=box.ROUNDED, show_header=False, header_style="bold magenta")
-        table.add_column("Option", style="dim", width=6)
-        table.add_column("Description", min_width=20)
-
-        table.add_row("1", "List C/C++ source files")
-        table.add_row("2", "Compile a C/C++ program")
-        table.add_row("3", "Run the compiled program")
-        table.add_row("4", "Run Valgrind on the program")
-        table.add_row("5", "Change Source Directory")
-        table.add_row("6", "Exit")
+        console.print(menu_table)
 
-        console.print(table)
+        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5", "6", "7", "8"], default="8")
 
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5", "6"], default="6")
+        if choice not in ("1", "8"):
+            # The session container may still be starting in the background
+            ensure_session()
 
         if choice == "1":
             # List C/C++ source files from the current context
@@ -230,14 +684,7 @@ def interactive_menu():
             if not c_files:
                 console.print("[bold red]No C/C++ source files found in the current directory.[/bold red]")
             else:
-                table_files = Table(show_header=True, header_style="bold magenta", box=box.MINIMAL_DOUBLE_HEAD)
-                table_files.add_column("No.", style="dim", width=6)
-                table_files.add_column("Filename", min_width=20)
-
-                for idx, file in enumerate(c_files, 1):
-                    table_files.add_row(str(idx), file)
-
-                console.print(table_files)
+                console.print(build_files_table(c_files))
 
         elif choice == "2":
             # Compile a C/C++ program
@@ -246,16 +693,10 @@ def interactive_menu():
                 continue
 
             # Determine the compiler based on file extension
-            if selected_file.endswith('.c'):
-                compiler = 'gcc'
-            elif selected_file.endswith('.cpp'):
-                compiler = 'g++'
-            else:
-                console.print("[bold red]Error:[/bold red] Unsupported file extension.")
-                continue
+            compiler = _COMPILER_MAP[os.path.splitext(selected_file)[1]]
 
             # Optional: Get compilation flags
-            compile_flags = Prompt.ask("Enter compilation flags (default: -Wall)", default="-Wall")
+            compile_flags = ask_compile_flags()
 
             # Compile the program
             compile_result = compile_program(selected_file, compile_flags, compiler)
@@ -263,7 +704,7 @@ def interactive_menu():
 
         elif choice == "3":
             # Run the compiled program
-            if not current_context['executable_path'] or not os.path.isfile(current_context['executable_path']):
+            if not current_context['executable_path']:
                 console.print("[bold red]Executable not found. Please compile a program first.[/bold red]")
                 continue
 
@@ -277,7 +718,7 @@ def interactive_menu():
 
         elif choice == "4":
             # Run Valgrind on the program
-            if not current_context['executable_path'] or not os.path.isfile(current_context['executable_path']):
+            if not current_context['executable_path']:
                 console.print("[bold red]Executable not found. Please compile a program first.[/bold red]")
                 continue
 
@@ -295,12 +736,37 @@ def interactive_menu():
             if not os.path.isdir(new_directory):
                 console.print(f"[bold red]Error:[/bold red] '{new_directory}' is not a valid directory.")
                 continue
+            _LIST_CACHE.clear()
             current_context['source_dir'] = os.path.abspath(new_directory)
             current_context['source_file'] = None
             current_context['executable_path'] = None
+
+            # Recreate the session container with the new directory mounted
+            stop_session_container()
+            start_session_container(current_context['source_dir'])
             console.print(f"[bold green]Source directory changed to '{new_directory}'.[/bold green]")
 
         elif choice == "6":
+            # Compile all C/C++ programs in the current directory
+            c_files = get_c_files(current_context['source_dir'])
+            if not c_files:
+                console.print("[bold red]No C/C++ source files found in the current directory.[/bold red]")
+                continue
+
+            compile_flags = ask_compile_flags()
+
+            statuses = compile_all(c_files, compile_flags)
+            display_compile_all_results(statuses)
+
+        elif choice == "7":
+            # Save the compiled program to the source directory
+            if not current_context['executable_path']:
+                console.print("[bold red]Executable not found. Please compile a program first.[/bold red]")
+                continue
+
+            save_executable(current_context['source_dir'])
+
+        elif choice == "8":
             # Exit the script
             console.print("[bold blue]Goodbye![/bold blue]")
             sys.exit(0)
@@ -326,6 +792,10 @@ def main():
     # Pull Docker image
     pull_docker_image(DOCKER_IMAGE)
 
+    # Start the session container once; compile/run/valgrind exec into it
+    start_session_in_background(current_context['source_dir'])
+    atexit.register(stop_session_container)
+
     # Start interactive menu
     interactive_menu()
 